@@ -0,0 +1,140 @@
+"""
+Benchmark: HTTP/1.1 (requests) vs. -http2 (httpx, multiplexed) endpoint testing.
+
+Starts a local TLS server that speaks HTTP/2 and HTTP/1.1 (hypercorn), serving an
+OpenAPI spec with many GET endpoints that each answer after a small delay, then runs
+full autoswagger scans against it with and without -http2 for both engines and
+reports wall time, mean time per request and the number of connections opened.
+
+Needs: pip install hypercorn "httpx[http2]" and the openssl CLI (for a throwaway
+self-signed certificate).
+
+Usage:
+  python benchmarks/http2_transport.py [--endpoints 300] [--delay 0.02] [--host-workers 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_app(endpoints, delay):
+    spec = json.dumps({
+        "openapi": "3.0.0",
+        "info": {"title": "bench", "version": "1"},
+        "paths": {f"/items/{i}": {"get": {"responses": {"200": {"description": "ok"}}}}
+                  for i in range(endpoints)},
+    }).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        path = scope["path"]
+        if path in ("/swagger.json", "/openapi.json"):
+            body, ctype = spec, b"application/json"
+        elif path.startswith("/items/"):
+            await asyncio.sleep(delay)
+            body, ctype = json.dumps({"id": path.rsplit("/", 1)[-1], "ok": True}).encode(), b"application/json"
+        else:
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", ctype), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def start_server(app, port, certfile, keyfile):
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = certfile
+    config.keyfile = keyfile
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.h2_max_concurrent_streams = 100
+    config.accesslog = None
+    config.errorlog = None
+    stop = threading.Event()
+
+    def run():
+        loop = asyncio.new_event_loop()
+
+        async def shutdown_trigger():
+            while not stop.is_set():
+                await asyncio.sleep(0.1)
+
+        loop.run_until_complete(serve(app, config, shutdown_trigger=shutdown_trigger))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    time.sleep(1.0)
+    return stop
+
+
+def make_cert(directory):
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", keyfile, "-out", certfile],
+        check=True, capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def run_scan(url, extra):
+    cmd = [sys.executable, os.path.join(ROOT, "autoswagger.py"), url,
+           "-json", "-stats", "-all", "-rate", "0", "-no-prescan"] + extra
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=tempfile.gettempdir())
+    elapsed = time.perf_counter() - start
+    out = proc.stdout
+    stats = json.loads(out[out.index("{"):])["stats"]
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=300)
+    parser.add_argument("--delay", type=float, default=0.02, help="Server-side delay per endpoint (seconds)")
+    parser.add_argument("--host-workers", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = make_cert(tmp)
+        stop = start_server(make_app(args.endpoints, args.delay), args.port, certfile, keyfile)
+        url = f"https://127.0.0.1:{args.port}"
+        try:
+            print(f"{args.endpoints} endpoints, {args.delay * 1000:.0f} ms server delay, "
+                  f"-host-workers {args.host_workers}, best of {args.repeat}\n")
+            print(f"{'engine':<8}{'transport':<11}{'wall s':>9}{'ms/req':>9}{'requests':>10}"
+                  f"{'conns':>7}{'h2 resp':>9}")
+            for engine in ("thread", "async"):
+                for label, extra in (("http/1.1", []), ("http2", ["-http2"])):
+                    flags = ["--engine", engine, "-host-workers", str(args.host_workers),
+                             "-concurrency", str(args.host_workers)] + extra
+                    runs = [run_scan(url, flags) for _ in range(args.repeat)]
+                    elapsed, stats = min(runs, key=lambda r: r[0])
+                    requests_sent = stats["total_requests_sent"]
+                    print(f"{engine:<8}{label:<11}{elapsed:>9.2f}"
+                          f"{elapsed * 1000 / max(1, requests_sent):>9.2f}{requests_sent:>10}"
+                          f"{stats['connections_opened']:>7}{stats.get('http2_responses', 0):>9}")
+        finally:
+            stop.set()
+
+
+if __name__ == "__main__":
+    main()
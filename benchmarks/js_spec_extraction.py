@@ -0,0 +1,138 @@
+"""
+Benchmark: embedded-spec extraction from JavaScript (extract_spec_from_js).
+
+Compares the tokenizer-based extractor in autoswagger.py with the previous
+regex-based one (copied below as legacy_extract_spec_from_js) on real swagger-ui
+bundles, a swagger-ui-express style initializer carrying a generated spec, the
+bundle and initializer concatenated, and a minified worst case for the lazy regexes.
+
+The bundles come from the swagger-ui-bundle package (pip install swagger-ui-bundle),
+or pass your own files with --bundle.
+
+Usage:
+  python benchmarks/js_spec_extraction.py [--bundle path/to/swagger-ui-bundle.js ...] [--paths 300]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import autoswagger  # noqa: E402
+
+
+def legacy_js_object_to_json(js_object_str):
+    try:
+        js_object_str = js_object_str.strip()
+        js_object_str = re.sub(r"'", r'"', js_object_str)
+        js_object_str = re.sub(r'([{,]\s*)(\w+)\s*:', r'\1"\2":', js_object_str)
+        js_object_str = re.sub(r',\s*([}\]])', r'\1', js_object_str)
+        return js_object_str
+    except Exception:
+        return None
+
+
+def legacy_extract_spec_from_js(js_text):
+    js_text = re.sub(r'/\*[\s\S]*?\*/', '', js_text)
+    js_text = re.sub(r'//.*', '', js_text)
+    patterns = [
+        r'(?:var|let|const)\s+(\w+)\s*=\s*({[\s\S]*?});',
+        r'(\w+)\s*=\s*({[\s\S]*?});',
+    ]
+    for pat in patterns:
+        matches = re.findall(pat, js_text, re.DOTALL)
+        for var_name, obj_str in matches:
+            cleaned_str = legacy_js_object_to_json(obj_str)
+            if cleaned_str:
+                try:
+                    return json.loads(cleaned_str)
+                except json.JSONDecodeError:
+                    continue
+    return None
+
+
+def make_spec(paths):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Bench API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com/v1"}],
+        "paths": {
+            f"/resource{i}/{{id}}": {
+                "get": {
+                    "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}],
+                    "responses": {"200": {"description": "ok"}},
+                }
+            }
+            for i in range(paths)
+        },
+    }
+
+
+def express_init(spec):
+    # Layout of the swagger-ui-init.js file served by swagger-ui-express
+    return (
+        "\nwindow.onload = function() {\n"
+        "  // Build a system\n"
+        "  var url = window.location.search.match(/url=([^&]+)/);\n"
+        "  if (url && url.length > 1) { url = decodeURIComponent(url[1]); } else { url = window.location.origin; }\n"
+        f"  var options = {{\n  \"swaggerDoc\": {json.dumps(spec, indent=2)},\n"
+        "  \"customOptions\": {}\n};\n"
+        "  url = options.swaggerUrl || url\n"
+        "  var ui = SwaggerUIBundle({ url: url, spec: options.swaggerDoc, dom_id: '#swagger-ui' })\n"
+        "  window.ui = ui\n}\n"
+    )
+
+
+def timed(fn, text, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def describe(result):
+    if not isinstance(result, dict):
+        return "none"
+    if autoswagger.SPEC_MARKER_KEYS & result.keys():
+        return f"spec ({len(result.get('paths', {}))} paths)"
+    return f"non-spec object ({len(result)} keys)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--bundle", action="append", default=[], help="JavaScript bundle(s) to use")
+    parser.add_argument("--paths", type=int, default=300, help="Paths in the generated embedded spec")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bundles = args.bundle
+    if not bundles:
+        try:
+            import swagger_ui_bundle
+        except ImportError:
+            sys.exit("Install swagger-ui-bundle or pass --bundle.")
+        bundles = sorted(glob.glob(os.path.join(swagger_ui_bundle.swagger_ui_path, "*.js")))
+
+    init = express_init(make_spec(args.paths))
+    cases = [(os.path.basename(b), open(b, encoding="utf-8", errors="ignore").read()) for b in bundles]
+    cases.append(("swagger-ui-init.js (express)", init))
+    main_bundle = max(cases, key=lambda c: len(c[1]))
+    cases.append((f"{main_bundle[0]} + init", main_bundle[1] + init))
+    cases.append(("minified worst case", "var q=1;" + "a={b:1,c:[2]}," * 8000 + "x;"))
+
+    print(f"{'input':<36}{'size':>10}{'legacy s':>10}{'new s':>9}{'speed-up':>10}  legacy / new result")
+    for name, text in cases:
+        old_time, old_result = timed(legacy_extract_spec_from_js, text, args.repeat)
+        new_time, new_result = timed(autoswagger.extract_spec_from_js, text, args.repeat)
+        print(f"{name[:35]:<36}{len(text):>10,}{old_time:>10.3f}{new_time:>9.3f}"
+              f"{old_time / max(new_time, 1e-9):>9.1f}x  {describe(old_result)} / {describe(new_result)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: per-request URL construction in endpoint testing.
+
+Compares the previous per-request path (a fresh re.sub per path parameter, a
+rescan of all parameters for the query string, then urlparse + urljoin) with
+RequestTemplate, which compiles the path template once and builds each URL by
+string assembly. Every value combination that brute mode (-b) would send is
+built by both, and the URLs are checked to be identical.
+
+Usage:
+  python benchmarks/url_building.py [--repeat 5]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from itertools import product
+from urllib.parse import urlencode, urljoin, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import autoswagger  # noqa: E402
+
+
+def legacy_substitute_path_parameters(path, parameters, value_mapping):
+    for param in parameters:
+        if param.get('in') == 'path':
+            param_name = param.get('name')
+            value = value_mapping.get(param_name)
+            if value is not None:
+                path = re.sub(rf'{{{param_name}}}|:{param_name}|<{param_name}>', str(value), path)
+    return path
+
+
+def legacy_generate_query_string(parameters, value_mapping):
+    query_params = {}
+    for param in parameters:
+        if param.get('in') == 'query':
+            param_name = param.get('name')
+            value = value_mapping.get(param_name)
+            if value is not None:
+                query_params[param_name] = value
+    return urlencode(query_params)
+
+
+def legacy_prepare_request(method, base_url_no_path, full_path, parameters, value_mapping, request_body, content_type):
+    substituted_path = legacy_substitute_path_parameters(full_path, parameters, value_mapping)
+    query_string = legacy_generate_query_string(parameters, value_mapping)
+    if not substituted_path.startswith('/'):
+        substituted_path = '/' + substituted_path
+    parsed_path = urlparse(substituted_path)
+    if parsed_path.scheme in ['http', 'https']:
+        full_url = substituted_path
+    else:
+        if query_string:
+            full_url = f"{urljoin(base_url_no_path, substituted_path)}?{query_string}"
+        else:
+            full_url = urljoin(base_url_no_path, substituted_path)
+    headers = {'Content-Type': content_type} if content_type else {}
+    data = request_body if method.upper() in ['POST', 'PUT', 'PATCH'] else None
+    return full_url, headers, data
+
+
+def param(name, location, ptype):
+    return {"name": name, "in": location, "schema": {"type": ptype}}
+
+
+CASES = [
+    ("1 path param", "/api/v1/users/{id}", [param("id", "path", "integer")]),
+    ("2 path + 2 query", "/api/v1/orgs/{org}/repos/{repo}",
+     [param("org", "path", "string"), param("repo", "path", "integer"),
+      param("page", "query", "integer"), param("active", "query", "boolean")]),
+    ("3 path (:id style) + 1 query", "/v2/:tenant/items/:item/revisions/:rev",
+     [param("tenant", "path", "string"), param("item", "path", "integer"),
+      param("rev", "path", "number"), param("q", "query", "string")]),
+]
+
+
+def combos(parameters):
+    names = [p["name"] for p in parameters]
+    values = [autoswagger.generate_parameter_values(p["schema"]["type"]) for p in parameters]
+    return [dict(zip(names, combo)) for combo in product(*values)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    base = "https://api.example.com"
+
+    print(f"{'template':<32}{'requests':>10}{'legacy us/req':>15}{'template us/req':>17}{'speed-up':>10}")
+    for name, path, parameters in CASES:
+        mappings = combos(parameters)
+        template = autoswagger.RequestTemplate("GET", base, path, parameters, None, None)
+        for mapping in mappings:
+            expected = legacy_prepare_request("GET", base, path, parameters, mapping, None, None)
+            assert template.build(mapping) == expected, (mapping, template.build(mapping), expected)
+
+        def run_legacy():
+            for mapping in mappings:
+                legacy_prepare_request("GET", base, path, parameters, mapping, None, None)
+
+        def run_template():
+            # Includes compiling the template, once per endpoint as in test_parameter_values
+            tpl = autoswagger.RequestTemplate("GET", base, path, parameters, None, None)
+            for mapping in mappings:
+                tpl.build(mapping)
+
+        timings = []
+        for fn in (run_legacy, run_template):
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                fn()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(best * 1e6 / len(mappings))
+        print(f"{name:<32}{len(mappings):>10,}{timings[0]:>15.2f}{timings[1]:>17.2f}{timings[0] / timings[1]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+AdaptiveController growth waking the jobs and requests held back by the old limit,
+in the thread scheduler and the async client.
+"""
+import asyncio
+import threading
+
+import pytest
+
+import autoswagger
+from autoswagger import ADAPTIVE_WINDOW, AsyncScanClient, EndpointScheduler
+
+TIMEOUT = 5
+
+
+@pytest.fixture
+def adaptive():
+    # Starts each host at a quarter of 8, i.e. 2 in flight
+    autoswagger.ADAPTIVE.configure(True, 8)
+    yield autoswagger.ADAPTIVE
+    autoswagger.ADAPTIVE.configure(False, 1)
+
+
+def grow(adaptive, host):
+    """
+    Feeds one healthy window of responses, which ramps host's limit up.
+    """
+    before = adaptive.concurrency(host)
+    for _ in range(ADAPTIVE_WINDOW):
+        adaptive.observe(host, 0.01, 200)
+    assert adaptive.concurrency(host) > before
+
+
+def test_limit_growth_starts_a_job_held_back_by_the_old_limit(adaptive):
+    scheduler = EndpointScheduler()
+    scheduler.start(max_workers=4, max_queued=100, host_limit=8)
+    release = threading.Event()
+    started = [threading.Event() for _ in range(2)]
+    third = threading.Event()
+    try:
+        def hold(ev):
+            ev.set()
+            assert release.wait(TIMEOUT)
+
+        running = [scheduler.submit("h", hold, ev) for ev in started]
+        assert all(ev.wait(TIMEOUT) for ev in started)
+        queued = scheduler.submit("h", third.set)
+        assert not third.wait(0.2)
+
+        # No job finishes here: only the waker can let the third one start
+        grow(adaptive, "h")
+        assert third.wait(TIMEOUT)
+        assert not release.is_set()
+    finally:
+        release.set()
+        scheduler.shutdown()
+    for fut in running + [queued]:
+        fut.result(TIMEOUT)
+
+
+def test_limit_growth_admits_async_requests_waiting_on_the_host(adaptive):
+    async def scenario():
+        client = AsyncScanClient(8)
+        try:
+            await client._acquire_host("h")
+            await client._acquire_host("h")
+            waiter = asyncio.ensure_future(client._acquire_host("h"))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            grow(adaptive, "h")
+            await asyncio.wait_for(waiter, TIMEOUT)
+            assert client._host_inflight["h"] == 3
+        finally:
+            await client.aclose()
+        assert client._limit_grew not in adaptive._wakers
+
+    asyncio.run(scenario())
+
+
+def test_wakers_are_not_called_when_the_limit_does_not_grow(adaptive):
+    calls = []
+    waker = lambda host, slots: calls.append((host, slots))
+    adaptive.add_waker(waker)
+    try:
+        adaptive.observe("h", 0.01, 200)        # Mid-window: no decision yet
+        adaptive.observe("h", 0.01, 429)        # Backing off never wakes anyone
+        assert calls == []
+    finally:
+        adaptive.remove_waker(waker)
+
+
+def test_wakers_get_the_number_of_new_slots(adaptive):
+    calls = []
+    waker = lambda host, slots: calls.append((host, slots))
+    adaptive.add_waker(waker)
+    try:
+        grow(adaptive, "h")
+    finally:
+        adaptive.remove_waker(waker)
+    assert calls == [("h", 2)]  # Slow start doubles 2 to 4
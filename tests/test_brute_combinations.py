@@ -0,0 +1,157 @@
+"""
+Brute mode combination strategies: pairwise coverage, random:N sampling, the
+exhaustive product and the per-endpoint request budget.
+"""
+import itertools
+import math
+import random
+
+import pytest
+
+import autoswagger
+from autoswagger import pairwise_combinations, parameter_value_steps, parse_brute_strategy
+
+SHAPES = [[1], [4], [2, 2], [3, 3, 3], [2, 5, 3, 4], [7, 1, 2], [10, 7, 2, 5, 2, 7]]
+
+
+def random_shape(seed):
+    rng = random.Random(seed)
+    return [rng.randint(1, 6) for _ in range(rng.randint(2, 6))]
+
+
+# A few more drawn at random, seeded so a failure can be replayed
+SHAPES += [random_shape(seed) for seed in range(5)]
+
+
+@pytest.fixture
+def brute():
+    yield autoswagger.BRUTE
+    autoswagger.BRUTE.configure()
+
+
+def uncovered_pairs(sizes, tuples):
+    wanted = {(i, a, j, b)
+              for i, j in itertools.combinations(range(len(sizes)), 2)
+              for a in range(sizes[i]) for b in range(sizes[j])}
+    for test in tuples:
+        for i, j in itertools.combinations(range(len(sizes)), 2):
+            wanted.discard((i, test[i], j, test[j]))
+    return wanted
+
+
+def send_all(parameters):
+    """
+    Drives parameter_value_steps in brute mode with every request failing and
+    returns the value mappings it sent.
+    """
+    steps = parameter_value_steps(parameters, brute=True)
+    sent = []
+    try:
+        mappings, _ = next(steps)
+        while True:
+            sent.extend(mappings)
+            mappings, _ = steps.send(None)
+    except StopIteration:
+        pass
+    return sent
+
+
+def params(*types):
+    return [{"name": f"p{n}", "in": "query", "schema": {"type": t}} for n, t in enumerate(types)]
+
+
+@pytest.mark.parametrize("sizes", SHAPES, ids=str)
+def test_pairwise_covers_every_value_pair(sizes):
+    tuples = list(pairwise_combinations(sizes))
+    assert not uncovered_pairs(sizes, tuples)
+    assert all(len(t) == len(sizes) and all(0 <= v < n for v, n in zip(t, sizes)) for t in tuples)
+    assert len(set(tuples)) == len(tuples)
+    assert tuples[0] == (0,) * len(sizes)
+    assert len(tuples) <= math.prod(sizes)
+
+
+@pytest.mark.parametrize("sizes", [[2, 2], [3, 3, 3], [2, 5, 3, 4]], ids=str)
+def test_pairwise_is_smaller_than_the_product(sizes):
+    tuples = list(pairwise_combinations(sizes))
+    # The largest two parameters bound it from below
+    largest = sorted(sizes)[-2:]
+    assert largest[0] * largest[1] <= len(tuples)
+    if len(sizes) > 2:
+        assert len(tuples) < math.prod(sizes)
+
+
+def test_pairwise_maps_indexes_to_values(brute):
+    brute.configure("pairwise")
+    value_lists = [["a", "b"], [1, 2, 3], [True, False]]
+    combos = list(brute.combinations(value_lists))
+    assert combos[0] == ("a", 1, True)
+    assert brute.count(value_lists) is None
+    assert not uncovered_pairs([2, 3, 2], [tuple(values.index(v) for values, v in zip(value_lists, c))
+                                           for c in combos])
+
+
+@pytest.mark.parametrize("sizes", SHAPES, ids=str)
+def test_exhaustive_is_the_full_product(brute, sizes):
+    brute.configure("exhaustive")
+    value_lists = [list(range(n)) for n in sizes]
+    assert list(brute.combinations(value_lists)) == list(itertools.product(*value_lists))
+    assert brute.count(value_lists) == math.prod(sizes)
+
+
+@pytest.mark.parametrize("sample_size", [1, 5, 20, 500])
+@pytest.mark.parametrize("sizes", [[2, 2], [7, 10, 2], [10, 10, 10]], ids=str)
+def test_random_yields_n_distinct_valid_combinations(brute, sizes, sample_size):
+    brute.configure(f"random:{sample_size}")
+    brute._random.seed(sample_size)
+    value_lists = [[f"{i}-{v}" for v in range(n)] for i, n in enumerate(sizes)]
+    combos = list(brute.combinations(value_lists))
+    expected = min(sample_size, math.prod(sizes))
+    assert len(combos) == len(set(combos)) == expected == brute.count(value_lists)
+    assert all(value in values for combo in combos for value, values in zip(combo, value_lists))
+
+
+@pytest.mark.parametrize("strategy", ["exhaustive", "pairwise", "random:50"])
+@pytest.mark.parametrize("budget", [1, 3, 10, 49])
+def test_budget_caps_requests_per_endpoint(brute, strategy, budget):
+    brute.configure(strategy, budget=budget)
+    sent = send_all(params("integer", "string", "boolean"))  # 7 * 10 * 2 combinations
+    assert len(sent) == budget
+    assert brute.stats()["brute_endpoints_over_budget"] == 1
+
+
+def test_budget_covers_the_fallback_types_too(brute):
+    brute.configure("exhaustive", budget=5)
+    # No types: probes integer, string, boolean, number with one request each
+    sent = send_all([{"name": "a", "in": "query"}, {"name": "b", "in": "path"}])
+    assert len(sent) == 4
+    brute.configure("exhaustive", budget=2)
+    assert len(send_all([{"name": "a", "in": "query"}])) == 2
+
+
+def test_zero_budget_is_unlimited(brute):
+    brute.configure("exhaustive", budget=0)
+    assert len(send_all(params("integer", "string", "boolean"))) == 7 * 10 * 2
+    assert brute.stats()["brute_endpoints_over_budget"] == 0
+
+
+def test_under_budget_sends_every_combination(brute):
+    brute.configure("random:8", budget=10)
+    sent = send_all(params("integer", "boolean"))
+    assert len(sent) == 8
+    assert len({tuple(m.items()) for m in sent}) == 8
+    assert brute.stats()["brute_endpoints_over_budget"] == 0
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("exhaustive", ("exhaustive", None)),
+    (" Pairwise ", ("pairwise", None)),
+    ("random:12", ("random", 12)),
+])
+def test_parse_brute_strategy(value, expected):
+    assert parse_brute_strategy(value) == expected
+
+
+@pytest.mark.parametrize("value", ["random", "random:0", "random:x", "pairwise:3", "all"])
+def test_parse_brute_strategy_rejects(value):
+    with pytest.raises(ValueError):
+        parse_brute_strategy(value)
@@ -0,0 +1,98 @@
+"""
+CircuitBreaker transitions (closed -> open -> half-open -> closed/open) on a fake
+monotonic clock.
+"""
+import pytest
+
+import autoswagger
+from autoswagger import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(autoswagger, "time", fake)
+    return fake
+
+
+def tripped(threshold=3, cooldown=30):
+    breaker = CircuitBreaker(threshold, cooldown)
+    for _ in range(threshold):
+        breaker.record_failure("h")
+    return breaker
+
+
+def test_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker(3, 30)
+    assert not breaker.record_failure("h")
+    assert not breaker.record_failure("h")
+    assert breaker.allow("h")
+    assert breaker.record_failure("h")  # Only the failure that opens it reports True
+    assert not breaker.allow("h")
+    assert breaker.allow("other")
+    with pytest.raises(CircuitOpenError):
+        breaker.check("h")
+    assert breaker.stats() == {"hosts_circuit_tripped": 1, "requests_short_circuited": 2}
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(3, 30)
+    breaker.record_failure("h")
+    breaker.record_failure("h")
+    breaker.record_success("h")
+    assert not breaker.record_failure("h")
+    assert breaker.allow("h")
+
+
+def test_half_open_lets_a_single_trial_through_after_cooldown(clock):
+    breaker = tripped()
+    clock.now += 29
+    assert not breaker.allow("h")
+    clock.now += 1
+    assert breaker.allow("h")      # The trial
+    assert not breaker.allow("h")  # Everything else waits for its outcome
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = tripped()
+    clock.now += 30
+    assert breaker.allow("h")
+    breaker.record_success("h")
+    assert breaker.allow("h") and breaker.allow("h")
+
+
+def test_failed_trial_reopens_for_another_cooldown(clock):
+    breaker = tripped()
+    clock.now += 30
+    assert breaker.allow("h")
+    assert not breaker.record_failure("h")  # Re-opening is not a new trip
+    clock.now += 29
+    assert not breaker.allow("h")
+    clock.now += 1
+    assert breaker.allow("h")
+    assert breaker.stats()["hosts_circuit_tripped"] == 1
+
+
+def test_trial_that_never_reports_back_expires_after_cooldown(clock):
+    breaker = tripped()
+    clock.now += 30
+    assert breaker.allow("h")  # Trial admitted, then lost (cancelled, non-transport error)
+    clock.now += 29
+    assert not breaker.allow("h")
+    clock.now += 1
+    assert breaker.allow("h")  # A new trial instead of staying open forever
+
+
+def test_threshold_zero_disables_the_breaker(clock):
+    breaker = CircuitBreaker(0, 30)
+    for _ in range(10):
+        assert not breaker.record_failure("h")
+    assert breaker.allow("h")
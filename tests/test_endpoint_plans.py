@@ -0,0 +1,153 @@
+"""
+Spec compilation: $ref resolution (cycles, external and unresolvable refs),
+allOf flattening, parameter merging and the EndpointPlans built from a spec.
+"""
+import json
+
+from autoswagger import RefResolver, compile_endpoint_plans, merge_parameters
+
+
+def openapi(paths, schemas=None, parameters=None):
+    return {
+        "openapi": "3.0.0",
+        "paths": paths,
+        "components": {"schemas": schemas or {}, "parameters": parameters or {}},
+    }
+
+
+def json_body(schema_ref):
+    return {"requestBody": {"content": {"application/json": {"schema": {"$ref": schema_ref}}}}}
+
+
+NODE = {
+    "type": "object",
+    "properties": {"name": {"type": "string"}, "child": {"$ref": "#/components/schemas/Node"}},
+}
+
+
+def test_self_referencing_schema_is_cut_at_the_cycle():
+    spec = openapi({}, {"Node": NODE})
+    resolver = RefResolver(spec)
+    node = resolver.resolve({"$ref": "#/components/schemas/Node"})
+    assert node["properties"]["name"] == {"type": "string"}
+    assert node["properties"]["child"] == {"$ref": "#/components/schemas/Node"}
+    assert resolver.cycles == 1
+
+
+def test_mutually_referencing_schemas_terminate():
+    spec = openapi({}, {
+        "A": {"type": "object", "properties": {"b": {"$ref": "#/components/schemas/B"}}},
+        "B": {"type": "object", "properties": {"a": {"$ref": "#/components/schemas/A"}, "n": {"type": "integer"}}},
+    })
+    resolver = RefResolver(spec)
+    a = resolver.resolve({"$ref": "#/components/schemas/A"})
+    assert a["properties"]["b"]["properties"]["a"] == {"$ref": "#/components/schemas/A"}
+    assert a["properties"]["b"]["properties"]["n"] == {"type": "integer"}
+    assert resolver.cycles == 1
+
+
+def test_circular_body_schema_still_builds_a_body():
+    spec = openapi({"/nodes": {"post": json_body("#/components/schemas/Node")}}, {"Node": NODE})
+    (plan,) = compile_endpoint_plans(spec, include_risk=True)
+    assert set(json.loads(plan.body)) == {"name"}
+
+
+def test_external_and_unresolvable_refs_are_left_as_is():
+    resolver = RefResolver(openapi({}, {"Pet": {"type": "object"}}))
+    for ref in ("other.yaml#/Pet", "https://example.com/spec.json#/Pet",
+                "#/components/schemas/Missing", "#/components/schemas/Pet/properties/x"):
+        assert resolver.resolve({"$ref": ref}) == {"$ref": ref}
+    assert resolver.cycles == 0
+
+
+def test_ref_path_escapes():
+    spec = {"paths": {}, "x": {"a/b": {"c~d": {"type": "string"}}}}
+    assert RefResolver(spec).resolve({"$ref": "#/x/a~1b/c~0d"}) == {"type": "string"}
+
+
+def test_all_of_is_flattened_into_one_object_schema():
+    spec = openapi({"/dogs": {"post": json_body("#/components/schemas/Dog")}}, {
+        "Pet": {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer"}}},
+        "Dog": {"allOf": [
+            {"$ref": "#/components/schemas/Pet"},
+            {"type": "object", "properties": {"bark": {"type": "boolean"}}},
+        ]},
+    })
+    (plan,) = compile_endpoint_plans(spec, include_risk=True)
+    assert "allOf" not in plan.schema
+    assert plan.schema["type"] == "object"
+    assert plan.schema["required"] == ["id"]
+    assert set(plan.schema["properties"]) == {"id", "bark"}
+    assert set(json.loads(plan.body)) == {"id", "bark"}
+
+
+def test_merge_parameters_operation_overrides_path_level():
+    path_params = [
+        {"name": "id", "in": "path", "schema": {"type": "string"}},
+        {"name": "q", "in": "query"},
+    ]
+    operation_params = [
+        {"name": "id", "in": "path", "schema": {"type": "integer"}},
+        {"name": "q", "in": "header"},  # Same name, other location: both kept
+    ]
+    merged = merge_parameters(path_params, operation_params)
+    assert [(p["name"], p["in"]) for p in merged] == [("id", "path"), ("q", "query"), ("q", "header")]
+    assert merged[0]["schema"] == {"type": "integer"}
+
+
+def test_merge_parameters_skips_non_dict_entries():
+    assert merge_parameters(["junk", None], [{"name": "a", "in": "query"}]) == [{"name": "a", "in": "query"}]
+
+
+def test_plans_merge_path_level_parameters_and_keep_path_and_query_only():
+    spec = openapi({
+        "/users/{id}": {
+            "parameters": [{"$ref": "#/components/parameters/Id"}, {"name": "trace", "in": "header"}],
+            "get": {"parameters": [{"name": "expand", "in": "query"}]},
+            "delete": {"parameters": [{"name": "id", "in": "path", "schema": {"type": "integer"}}]},
+        },
+    }, parameters={"Id": {"name": "id", "in": "path", "schema": {"type": "string"}}})
+    plans = {plan.method: plan for plan in compile_endpoint_plans(spec, include_risk=True)}
+    assert [(p["name"], p["in"]) for p in plans["get"].parameters] == [("id", "path"), ("expand", "query")]
+    assert plans["get"].parameters[0]["schema"] == {"type": "string"}
+    assert plans["delete"].parameters == [{"name": "id", "in": "path", "schema": {"type": "integer"}}]
+
+
+def test_unresolvable_parameter_ref_is_dropped_from_the_plan():
+    spec = openapi({"/a": {"get": {"parameters": [{"$ref": "#/components/parameters/Missing"},
+                                                  {"name": "q", "in": "query"}]}}})
+    (plan,) = compile_endpoint_plans(spec)
+    assert plan.parameters == [{"name": "q", "in": "query"}]
+
+
+def test_non_get_methods_need_risk():
+    spec = openapi({"/a": {"get": {}, "post": {}, "head": {}}})
+    assert [plan.method for plan in compile_endpoint_plans(spec)] == ["get"]
+    assert [plan.method for plan in compile_endpoint_plans(spec, include_risk=True)] == ["get", "post"]
+
+
+def test_one_plan_per_request_body_content_type():
+    schema = {"type": "object", "properties": {"name": {"type": "string"}}}
+    spec = openapi({"/a": {
+        "post": {"requestBody": {"content": {"application/json": {"schema": schema},
+                                             "application/x-www-form-urlencoded": {"schema": schema}}}},
+        "put": {"requestBody": {"content": {}}},
+    }})
+    plans = compile_endpoint_plans(spec, include_risk=True)
+    assert [(p.method, p.content_type) for p in plans] == [
+        ("post", "application/json"), ("post", "application/x-www-form-urlencoded")]
+    assert json.loads(plans[0].body) == {"name": plans[1].body.split("=", 1)[1]}
+
+
+def test_swagger2_body_parameter_with_ref():
+    spec = {
+        "swagger": "2.0",
+        "paths": {"/pets": {"post": {"parameters": [
+            {"name": "body", "in": "body", "schema": {"$ref": "#/definitions/Pet"}},
+        ]}}},
+        "definitions": {"Pet": {"type": "object", "properties": {"name": {"type": "string"}}}},
+    }
+    (plan,) = compile_endpoint_plans(spec, include_risk=True)
+    assert plan.content_type == "application/json"
+    assert plan.parameters == []
+    assert set(json.loads(plan.body)) == {"name"}
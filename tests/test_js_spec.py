@@ -0,0 +1,111 @@
+"""
+Embedded spec extraction from JavaScript: the tokenizer, the full-file scan for
+spec literals and extract_spec_from_js on initializers and bundles.
+"""
+import json
+import time
+
+from autoswagger import extract_spec_from_js, iter_js_spec_literals, iter_js_tokens, js_object_to_json
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "paths": {"/users/{id}": {"get": {"responses": {"200": {"description": "ok"}}}}},
+}
+
+# Shape of the swagger-ui-init.js that swagger-ui-express serves
+EXPRESS_INIT = (
+    "\nwindow.onload = function() {\n"
+    "  // Build a system\n"
+    "  var url = window.location.search.match(/url=([^&]+)/);\n"
+    "  if (url && url.length > 1) { url = decodeURIComponent(url[1]); } else { url = window.location.origin; }\n"
+    f"  var options = {{\n  \"swaggerDoc\": {json.dumps(SPEC, indent=2)},\n"
+    "  \"customOptions\": {}\n};\n"
+    "  url = options.swaggerUrl || url\n"
+    "  var ui = SwaggerUIBundle({ url: url, spec: options.swaggerDoc, dom_id: '#swagger-ui' })\n"
+    "  window.ui = ui\n}\n"
+)
+
+# Bundle-like code full of braces inside strings, regex and template literals
+BUNDLE_NOISE = (
+    "var a = \"{\", b = '}}', c = `${a} {`;\n"
+    "var re = /\\{([^}]+)\\}/g, ratio = total / count / 2;\n"
+    "function render(t) { return t.replace(/[{}]/g, '') + \"/*\" + '//'; }\n"
+) * 200
+
+# Minified worst case from benchmarks/js_spec_extraction.py
+MINIFIED_WORST_CASE = "var q=1;" + "a={b:1,c:[2]}," * 8000 + "x;"
+
+
+def spans(js_text):
+    return [js_text[start:end] for start, end in iter_js_spec_literals(js_text)]
+
+
+def test_swagger_ui_express_initializer():
+    assert extract_spec_from_js(EXPRESS_INIT) == SPEC
+
+
+def test_initializer_appended_to_a_bundle():
+    assert extract_spec_from_js(BUNDLE_NOISE + EXPRESS_INIT) == SPEC
+
+
+def test_spec_after_strings_and_regex_literals_with_braces():
+    js = BUNDLE_NOISE + "var spec = {swagger: '2.0', paths: {'/a': {}}};\n"
+    assert spans(js) == ["{swagger: '2.0', paths: {'/a': {}}}"]
+    assert extract_spec_from_js(js) == {"swagger": "2.0", "paths": {"/a": {}}}
+
+
+def test_comment_markers_inside_strings():
+    js = ("var home = 'http://example.com/*', api = \"https://example.com//v1\";\n"
+          "var spec = {openapi: '3.0.0', paths: {}};\n"
+          "var tail = '*/';\n")
+    assert spans(js) == ["{openapi: '3.0.0', paths: {}}"]
+    assert extract_spec_from_js(js) == {"openapi": "3.0.0", "paths": {}}
+
+
+def test_comments_are_skipped():
+    js = "/* var fake = {openapi: '3.0.0', paths: {}}; { */\n// }\nvar spec = {\"swagger\": \"2.0\", \"paths\": {}};"
+    assert spans(js) == ['{"swagger": "2.0", "paths": {}}']
+
+
+def test_division_is_not_a_regex_literal():
+    tokens = [(kind, text) for kind, text, _ in iter_js_tokens("x = a / b / {c: 1}; y = /{/g")]
+    assert ("regex", "/{/g") in tokens
+    assert [text for kind, text in tokens if kind == "slash"] == ["/", "/"]
+
+
+def test_spec_nested_in_a_config_object():
+    js = "SwaggerUIBundle({dom_id: '#ui', spec: {openapi: '3.1.0', paths: {}}, layout: 'x'})"
+    assert extract_spec_from_js(js) == {"openapi": "3.1.0", "paths": {}}
+
+
+def test_spec_found_by_the_full_scan_when_the_hint_is_deeply_nested():
+    # Every '{' just before the first hint closes before it, so the whole file is scanned
+    js = "var spec = {info: {a: {b: {c: {d: {e: 1}}}}}, openapi: '3.0.0', paths: {}};"
+    assert extract_spec_from_js(js) == {"info": {"a": {"b": {"c": {"d": {"e": 1}}}}}, "openapi": "3.0.0", "paths": {}}
+
+
+def test_hint_inside_a_string_only():
+    assert extract_spec_from_js("var doc = 'openapi: \"3.0.0\"'; var paths = 1;") is None
+
+
+def test_blocks_are_not_object_literals():
+    assert spans("function f() { paths: for (;;) {} }") == []
+
+
+def test_minified_worst_case():
+    started = time.perf_counter()
+    assert extract_spec_from_js(MINIFIED_WORST_CASE) is None
+    assert spans(MINIFIED_WORST_CASE) == []
+    assert time.perf_counter() - started < 2  # The old lazy regexes took seconds here
+
+
+def test_js_object_to_json_converts_plain_data():
+    js = "{a: 'x', \"b\": [1, -2.5, 0x1F, true, null,], 'c': {d: `t`}, 200: {},}"
+    assert json.loads(js_object_to_json(js)) == {"a": "x", "b": [1, -2.5, 31, True, None], "c": {"d": "t"}, "200": {}}
+
+
+def test_js_object_to_json_rejects_code():
+    assert js_object_to_json("{a: foo()}") is None
+    assert js_object_to_json("{a: `${x}`}") is None
+    assert js_object_to_json("{a: /re/}") is None
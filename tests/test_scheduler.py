@@ -0,0 +1,147 @@
+"""
+EndpointScheduler: round-robin fairness, per-host limits, the bounded submission
+queue and brute mode slot lending. Jobs block on events rather than sleeping, so
+every assertion is about state the test has waited for.
+"""
+import threading
+
+import pytest
+
+import autoswagger
+from autoswagger import EndpointScheduler
+
+TIMEOUT = 5
+
+
+@pytest.fixture
+def scheduler():
+    sched = EndpointScheduler()
+    yield sched
+    sched.shutdown()
+
+
+def blocker(started, release):
+    def job():
+        started.set()
+        assert release.wait(TIMEOUT)
+    return job
+
+
+def test_jobs_from_different_hosts_run_round_robin(scheduler):
+    scheduler.start(max_workers=1, max_queued=100, host_limit=1)
+    started, release = threading.Event(), threading.Event()
+    gate = scheduler.submit("gate", blocker(started, release))
+    assert started.wait(TIMEOUT)
+
+    order = []
+    futures = [scheduler.submit("a", order.append, f"a{i}") for i in range(3)]
+    futures += [scheduler.submit("b", order.append, f"b{i}") for i in range(2)]
+    release.set()
+    for fut in [gate] + futures:
+        fut.result(TIMEOUT)
+
+    assert order == ["a0", "b0", "a1", "b1", "a2"]
+
+
+def test_host_limit_caps_running_jobs_per_host(scheduler):
+    scheduler.start(max_workers=4, max_queued=100, host_limit=2)
+    release = threading.Event()
+    started = [threading.Event() for _ in range(3)]
+    futures = [scheduler.submit("a", blocker(ev, release)) for ev in started]
+    assert started[0].wait(TIMEOUT) and started[1].wait(TIMEOUT)
+
+    # A free worker still serves another host while "a" is at its limit
+    other = scheduler.submit("b", lambda: "b")
+    assert other.result(TIMEOUT) == "b"
+    assert not started[2].is_set()
+    assert scheduler._running["a"] == 2
+
+    release.set()
+    for fut in futures:
+        fut.result(TIMEOUT)
+    assert started[2].is_set()
+
+
+def test_submit_blocks_while_the_queue_is_full(scheduler):
+    scheduler.start(max_workers=1, max_queued=2, host_limit=1)
+    started, release = threading.Event(), threading.Event()
+    scheduler.submit("a", blocker(started, release))
+    assert started.wait(TIMEOUT)
+    scheduler.submit("a", lambda: None)
+    scheduler.submit("a", lambda: None)
+
+    submitted = threading.Event()
+
+    def submit_third():
+        scheduler.submit("a", lambda: None)
+        submitted.set()
+
+    thread = threading.Thread(target=submit_third, daemon=True)
+    thread.start()
+    assert not submitted.wait(0.2)
+    assert scheduler._queued == 2
+
+    release.set()
+    assert submitted.wait(TIMEOUT)
+    thread.join(TIMEOUT)
+
+
+def test_lend_slot_hands_the_job_slot_to_sub_requests_and_takes_it_back(scheduler):
+    scheduler.start(max_workers=2, max_queued=100, host_limit=1)
+    seen = {}
+    lent = threading.Event()
+    release = threading.Event()
+    other_started = threading.Event()
+
+    def brute_job():
+        with scheduler.lend_slot("a"):
+            seen["lending"] = (scheduler._running["a"], scheduler._lending["a"])
+            with scheduler.host_slot("a"):
+                seen["sub_request"] = scheduler._running["a"]
+                lent.set()
+                assert release.wait(TIMEOUT)
+        seen["after"] = (scheduler._running["a"], scheduler._lending["a"])
+
+    job = scheduler.submit("a", brute_job)
+    assert lent.wait(TIMEOUT)
+    # The lending job still counts towards the host's job limit
+    queued = scheduler.submit("a", other_started.set)
+    assert not other_started.wait(0.2)
+
+    release.set()
+    job.result(TIMEOUT)
+    queued.result(TIMEOUT)
+    assert seen["lending"] == (0, 1)
+    assert seen["sub_request"] == 1
+    assert seen["after"] == (1, 0)
+    assert not scheduler._lending
+
+
+def test_host_slot_waits_for_a_free_slot(scheduler):
+    scheduler.start(max_workers=1, max_queued=100, host_limit=1)
+    started, release = threading.Event(), threading.Event()
+    job = scheduler.submit("a", blocker(started, release))
+    assert started.wait(TIMEOUT)
+
+    acquired = threading.Event()
+
+    def sub_request():
+        with scheduler.host_slot("a"):
+            acquired.set()
+
+    thread = threading.Thread(target=sub_request, daemon=True)
+    thread.start()
+    assert not acquired.wait(0.2)
+
+    release.set()
+    job.result(TIMEOUT)
+    assert acquired.wait(TIMEOUT)
+    thread.join(TIMEOUT)
+    assert not scheduler._running
+
+
+def test_shutdown_unregisters_the_adaptive_waker(scheduler):
+    scheduler.start(max_workers=1, max_queued=1, host_limit=1)
+    assert scheduler.wake in autoswagger.ADAPTIVE._wakers
+    scheduler.shutdown()
+    assert scheduler.wake not in autoswagger.ADAPTIVE._wakers